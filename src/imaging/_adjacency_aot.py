@@ -0,0 +1,58 @@
+"""Ahead-of-time compilation of the adjacency kernel with numba.pycc.
+
+Build the ``adjacency_aot`` extension module next to this file once numba is
+installed:
+
+    python -m src.imaging._adjacency_aot
+
+The adjacency module imports the compiled module when it exists, so processes
+skip the JIT compilation and cache loading of the numba kernel. The compiled
+kernel is serial and specialized for C-contiguous uint8 data, the storage used
+by CategoricalImage for up to 256 categories.
+"""
+
+from pathlib import Path
+
+from numba.pycc import CC
+
+cc = CC("adjacency_aot")
+cc.output_dir = str(Path(__file__).parent)
+
+
+@cc.export("touches_u8", "b1(u1[:, :, ::1], u1, u1, i4[:, ::1])")
+def touches_u8(data, v1, v2, offsets):
+    """Check if any voxel equal to v1 has a neighbor equal to v2.
+
+    Args:
+        data: C-contiguous 3D uint8 encoded image
+        v1: Encoded value of the first category
+        v2: Encoded value of the second category
+        offsets: (N, 3) array of neighbor offsets to check around each voxel
+
+    Returns:
+        True if any v1 voxel has a v2 voxel at one of the given offsets
+    """
+    depth, height, width = data.shape
+
+    for z in range(depth):
+        for y in range(height):
+            for x in range(width):
+                if data[z, y, x] != v1:
+                    continue
+                for k in range(offsets.shape[0]):
+                    nz = z + offsets[k, 0]
+                    ny = y + offsets[k, 1]
+                    nx = x + offsets[k, 2]
+                    if (
+                        0 <= nz < depth
+                        and 0 <= ny < height
+                        and 0 <= nx < width
+                        and data[nz, ny, nx] == v2
+                    ):
+                        return True
+
+    return False
+
+
+if __name__ == "__main__":
+    cc.compile()
@@ -0,0 +1,98 @@
+"""Numba-compiled kernels for adjacency checks on integer-encoded 3D images.
+
+This module requires numba and is imported optionally by the adjacency module.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True, parallel=True, boundscheck=False)
+def touches(data: np.ndarray, v1: int, v2: int, offsets: np.ndarray) -> bool:
+    """Check if any voxel equal to v1 has a neighbor equal to v2.
+
+    Scans the volume once without allocating intermediate masks. Slices along
+    the first axis are processed in parallel and share a found flag, so all
+    threads stop scanning once any of them finds an adjacent pair.
+
+    Args:
+        data: 3D integer-encoded image
+        v1: Encoded value of the first category
+        v2: Encoded value of the second category
+        offsets: (N, 3) array of neighbor offsets to check around each voxel
+
+    Returns:
+        True if any v1 voxel has a v2 voxel at one of the given offsets
+    """
+    depth, height, width = data.shape
+    found = np.zeros(1, dtype=np.uint8)
+
+    for z in prange(depth):
+        for y in range(height):
+            if found[0]:
+                break
+            for x in range(width):
+                if data[z, y, x] != v1:
+                    continue
+                for k in range(offsets.shape[0]):
+                    nz = z + offsets[k, 0]
+                    ny = y + offsets[k, 1]
+                    nx = x + offsets[k, 2]
+                    if (
+                        0 <= nz < depth
+                        and 0 <= ny < height
+                        and 0 <= nx < width
+                        and data[nz, ny, nx] == v2
+                    ):
+                        found[0] = 1
+                        break
+                if found[0]:
+                    break
+
+    return found[0] != 0
+
+
+@njit(cache=True, boundscheck=False)
+def any_adjacent_3d(data: np.ndarray, id_a: int, id_b: int, offsets: np.ndarray) -> bool:
+    """Check if any voxel equal to id_a is adjacent to a voxel equal to id_b.
+
+    Serial variant for small volumes, where starting parallel threads costs
+    more than the scan. Each unordered pair of neighbors is visited once, from
+    the voxel that comes first in scan order, so only the forward half of the
+    neighbor offsets is needed; a pair matches if it holds id_a and id_b in
+    either order. The scan returns at the first match.
+
+    Args:
+        data: 3D integer-encoded image
+        id_a: Encoded value of the first category
+        id_b: Encoded value of the second category
+        offsets: (13, 3) array of the lexicographically positive neighbor offsets
+
+    Returns:
+        True if any id_a voxel has an id_b voxel among its 26 neighbors
+    """
+    depth, height, width = data.shape
+
+    for z in range(depth):
+        for y in range(height):
+            for x in range(width):
+                value = data[z, y, x]
+                if value == id_a:
+                    other = id_b
+                elif value == id_b:
+                    other = id_a
+                else:
+                    continue
+                for k in range(offsets.shape[0]):
+                    nz = z + offsets[k, 0]
+                    ny = y + offsets[k, 1]
+                    nx = x + offsets[k, 2]
+                    if (
+                        0 <= nz < depth
+                        and 0 <= ny < height
+                        and 0 <= nx < width
+                        and data[nz, ny, nx] == other
+                    ):
+                        return True
+
+    return False
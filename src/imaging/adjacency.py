@@ -1,10 +1,268 @@
 """Functions for analyzing adjacency relationships in categorical 3D medical images."""
 
+import itertools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
-from scipy import ndimage
 
 from .categorical import CategoricalImage
 
+# Numba is optional; without it the NumPy implementation is used
+try:
+    from ._adjacency_numba import any_adjacent_3d as _any_adjacent_3d
+    from ._adjacency_numba import touches as _touches
+except ImportError:
+    _any_adjacent_3d = None
+    _touches = None
+
+# Kernel compiled ahead of time by _adjacency_aot, if it has been built
+try:
+    from .adjacency_aot import touches_u8 as _touches_u8
+except ImportError:
+    _touches_u8 = None
+
+# All 26 (dz, dy, dx) neighbor offsets of a voxel (26-connectivity)
+_NEIGHBOR_OFFSETS = tuple(
+    offset for offset in itertools.product((-1, 0, 1), repeat=3) if offset != (0, 0, 0)
+)
+_NEIGHBOR_OFFSET_ARRAY = np.array(_NEIGHBOR_OFFSETS, dtype=np.int32)
+
+# The 13 lexicographically positive offsets; each unordered neighbor pair is
+# reached from exactly one of its voxels
+_FORWARD_OFFSET_ARRAY = np.array(
+    [offset for offset in _NEIGHBOR_OFFSETS if offset > (0, 0, 0)], dtype=np.int32
+)
+
+# Beyond the scan itself, the compiled kernels do bounds-checked neighbor reads
+# for each matching voxel: voxels of either category for the serial kernel, of
+# the first category for the parallel and ahead-of-time kernels. That work grows
+# with the fill of the pair, while the bit-packed scan costs the same at any
+# density, so pairs filling more than this fraction of the volume use the scan.
+_KERNEL_MAX_FILL = 0.04
+
+# Volumes at least this large go to the parallel JIT kernel; below it the
+# serial kernel avoids the cost of starting threads
+_KERNEL_PARALLEL_MIN_VOXELS = 1_000_000
+
+# Volumes at least this large are scanned in parallel tiles by the NumPy path
+_PARALLEL_MIN_VOXELS = 8_000_000
+_PARALLEL_WORKERS = os.process_cpu_count() or 1
+
+
+def _offset_slices(offset: tuple[int, ...]) -> tuple[tuple[slice, ...], tuple[slice, ...]]:
+    """Build paired slices aligning each voxel with its neighbor at the given offset.
+
+    Args:
+        offset: Per-axis shift, each component in {-1, 0, 1}
+
+    Returns:
+        Tuple of (src, dst) slice tuples such that ``array[src][i]`` and
+        ``array[dst][i]`` are neighbors at ``offset`` for every index i
+    """
+    src = []
+    dst = []
+    for delta in offset:
+        if delta > 0:
+            src.append(slice(None, -delta))
+            dst.append(slice(delta, None))
+        elif delta < 0:
+            src.append(slice(-delta, None))
+            dst.append(slice(None, delta))
+        else:
+            src.append(slice(None))
+            dst.append(slice(None))
+    return tuple(src), tuple(dst)
+
+
+# Offsets over the first two axes with their paired slices, used by the
+# bit-packed scan once neighbors along the last axis are folded into the rows
+_ROW_OFFSET_SLICES = tuple(
+    (offset, *_offset_slices(offset)) for offset in itertools.product((-1, 0, 1), repeat=2)
+)
+
+
+def _bounding_box(mask: np.ndarray) -> tuple[int, int, int, int, int, int]:
+    """Compute the inclusive bounding box of the True voxels of a non-empty mask.
+
+    Each axis is reduced only over the slab already bounded on the previous
+    axes, so the later reductions touch just the occupied region.
+
+    Args:
+        mask: Non-empty 3D boolean mask
+
+    Returns:
+        Tuple of (zmin, zmax, ymin, ymax, xmin, xmax)
+    """
+    zs = np.flatnonzero(mask.any(axis=(1, 2)))
+    zmin, zmax = int(zs[0]), int(zs[-1])
+    mask = mask[zmin : zmax + 1]
+
+    ys = np.flatnonzero(mask.any(axis=(0, 2)))
+    ymin, ymax = int(ys[0]), int(ys[-1])
+    mask = mask[:, ymin : ymax + 1]
+
+    xs = np.flatnonzero(mask.any(axis=(0, 1)))
+    xmin, xmax = int(xs[0]), int(xs[-1])
+
+    return zmin, zmax, ymin, ymax, xmin, xmax
+
+
+def _adjacency_window(mask1: np.ndarray, mask2: np.ndarray) -> tuple[slice, ...] | None:
+    """Find the region that can contain adjacent voxels of two non-empty masks.
+
+    A voxel of one mask can only touch the other mask if it lies within the
+    other mask's bounding box grown by one voxel, so both masks only need to
+    be compared inside the hull of those two overlaps.
+
+    Args:
+        mask1: Non-empty 3D boolean mask of the first category
+        mask2: Non-empty 3D boolean mask of the second category
+
+    Returns:
+        Tuple of slices selecting the region, or None if the bounding boxes are
+        more than one voxel apart on some axis and the masks cannot touch
+    """
+    box1 = _bounding_box(mask1)
+    box2 = _bounding_box(mask2)
+
+    window = []
+    for axis in range(3):
+        min1, max1 = box1[2 * axis], box1[2 * axis + 1]
+        min2, max2 = box2[2 * axis], box2[2 * axis + 1]
+
+        # Extent of each mask's voxels within reach of the other's bounding box
+        start1, stop1 = max(min1, min2 - 1), min(max1, max2 + 1)
+        start2, stop2 = max(min2, min1 - 1), min(max2, max1 + 1)
+        if start1 > stop1 or start2 > stop2:
+            return None
+
+        window.append(slice(min(start1, start2), max(stop1, stop2) + 1))
+    return tuple(window)
+
+
+def _pack_rows(mask: np.ndarray) -> np.ndarray:
+    """Pack each row of a 3D boolean mask along the last axis into 64-bit words.
+
+    Bit ``b`` of word ``k`` in a row holds the voxel at ``x = 64 * k + b``. Rows
+    are zero-padded to a whole number of words.
+
+    Args:
+        mask: 3D boolean mask
+
+    Returns:
+        Little-endian uint64 array of shape (depth, height, ceil(width / 64))
+    """
+    packed = np.packbits(mask, axis=2, bitorder="little")
+    padding = -packed.shape[2] % 8
+    if padding:
+        packed = np.pad(packed, ((0, 0), (0, 0), (0, padding)))
+    # packbits and pad keep the layout of non C-ordered masks, but the view
+    # needs contiguous rows
+    return np.ascontiguousarray(packed).view("<u8")
+
+
+def _any_adjacent(
+    mask1: np.ndarray,
+    mask2: np.ndarray,
+    cancel: threading.Event | None = None,
+) -> bool:
+    """Check if any True voxel of mask1 has a 26-connected neighbor True in mask2.
+
+    Both masks are packed to one bit per voxel, so each word operation covers
+    64 voxels. Neighbors along the last axis are folded into mask1 with bit
+    shifts (carrying across word boundaries), after which only the 9 offsets
+    over the first two axes remain. Each compares shifted views of the packed
+    masks and returns as soon as an adjacent pair is found.
+
+    Args:
+        mask1: 3D boolean mask of the first category
+        mask2: 3D boolean mask of the second category, same shape as mask1
+        cancel: Optional event checked before each offset; once set, the scan
+            stops and returns False
+
+    Returns:
+        True if the masks are adjacent, False otherwise
+    """
+    words1 = _pack_rows(mask1)
+    words2 = _pack_rows(mask2)
+
+    # Voxels one step away along the last axis, then including the voxel itself
+    row_neighbors = (words1 << 1) | (words1 >> 1)
+    row_neighbors[..., 1:] |= words1[..., :-1] >> 63
+    row_neighbors[..., :-1] |= words1[..., 1:] << 63
+    row_grown = row_neighbors | words1
+
+    for offset, src, dst in _ROW_OFFSET_SLICES:
+        if cancel is not None and cancel.is_set():
+            return False
+
+        view1 = row_neighbors[src] if offset == (0, 0) else row_grown[src]
+        view2 = words2[dst]
+
+        # Offsets reaching past a singleton axis have no neighbor pairs
+        if view1.size == 0:
+            continue
+
+        if np.any(view1 & view2):
+            return True
+    return False
+
+
+def _any_adjacent_parallel(mask1: np.ndarray, mask2: np.ndarray, workers: int) -> bool:
+    """Check adjacency by scanning tiles of the volume in parallel threads.
+
+    The volume is split along the first axis into tiles that overlap by one
+    voxel, so pairs straddling a seam are still found. NumPy releases the GIL
+    in the element-wise kernels, so threads scan tiles concurrently; the first
+    tile to find an adjacent pair cancels the others.
+
+    Args:
+        mask1: 3D boolean mask of the first category
+        mask2: 3D boolean mask of the second category, same shape as mask1
+        workers: Number of tiles and worker threads
+
+    Returns:
+        True if the masks are adjacent, False otherwise
+    """
+    depth = mask1.shape[0]
+    bounds = np.linspace(0, depth, workers + 1).astype(int)
+    tiles = [
+        slice(start, min(stop + 1, depth))
+        for start, stop in zip(bounds[:-1], bounds[1:])
+        if stop > start
+    ]
+
+    cancel = threading.Event()
+
+    def scan(tile: slice) -> bool:
+        if _any_adjacent(mask1[tile], mask2[tile], cancel):
+            cancel.set()
+            return True
+        return False
+
+    with ThreadPoolExecutor(max_workers=len(tiles)) as executor:
+        return any(list(executor.map(scan, tiles)))
+
+
+def _kernel_value_fits(value: object, dtype: np.dtype) -> bool:
+    """Check if a legacy category_map value can be passed to a compiled kernel.
+
+    Args:
+        value: Encoded value from the category_map
+        dtype: Integer or bool dtype of the legacy array
+
+    Returns:
+        True if value is an integer within the range of dtype
+    """
+    if not isinstance(value, (int, np.integer)):
+        return False
+    if dtype.kind == "b":
+        return 0 <= value <= 1
+    info = np.iinfo(dtype)
+    return info.min <= value <= info.max
+
 
 def check_category_adjacency(
     image: CategoricalImage | np.ndarray,
@@ -49,12 +307,22 @@ def check_category_adjacency(
     """
     # Handle CategoricalImage input
     if isinstance(image, CategoricalImage):
-        mask1 = image.get_mask(category1)
-        mask2 = image.get_mask(category2)
+        # Work on the encoded values; masks are only built if a path needs them
+        data = image.data
+        value1 = image._get_category_index(category1)
+        value2 = image._get_category_index(category2)
 
-        # If either category doesn't exist in the image, they can't touch
-        if not np.any(mask1) or not np.any(mask2):
+        # Category presence is stored on the image, so absent categories are
+        # rejected without touching the volume
+        if not image._present_mask[value1] or not image._present_mask[value2]:
             return False
+
+        fill = int(image._counts[value1]) + int(image._counts[value2])
+        use_kernel = fill <= _KERNEL_MAX_FILL * data.size
+
+        # A present category overlaps itself, matching the 3x3x3 dilation semantics
+        if category1 == category2:
+            return True
     else:
         # Legacy numpy array path
         if category_map is None:
@@ -82,21 +350,71 @@ def check_category_adjacency(
         value1 = reverse_map[category1]
         value2 = reverse_map[category2]
 
+        # Masks are only built for the NumPy fallback; the compiled kernels
+        # find absent categories in their single pass. Counting the categories
+        # would cost a pass too, so integer arrays always go to a kernel if
+        # available. Kernels are only compiled for native byte order integer
+        # arrays and values that fit their dtype; everything else (object or
+        # big-endian arrays, map values out of range) uses the mask path.
+        data = image
+        use_kernel = (
+            data.dtype.kind in "biu"
+            and data.dtype.isnative
+            and _kernel_value_fits(value1, data.dtype)
+            and _kernel_value_fits(value2, data.dtype)
+        )
+
+        # A category touches itself wherever it is present
+        if category1 == category2:
+            return bool(np.any(data == value1))
+
+    # Single fused pass over the encoded data when a compiled kernel is available
+    # and the categories are sparse. The ahead-of-time kernel has no JIT cost
+    # but is serial, so large volumes go to the parallel JIT kernel when numba
+    # is installed.
+    if (
+        use_kernel
+        and _touches_u8 is not None
+        and data.dtype == np.uint8
+        and data.flags.c_contiguous
+        and (_touches is None or data.size < _KERNEL_PARALLEL_MIN_VOXELS)
+    ):
+        return bool(_touches_u8(data, value1, value2, _NEIGHBOR_OFFSET_ARRAY))
+
+    if use_kernel and _touches is not None:
+        if data.size < _KERNEL_PARALLEL_MIN_VOXELS:
+            return bool(_any_adjacent_3d(data, value1, value2, _FORWARD_OFFSET_ARRAY))
+        return bool(_touches(data, value1, value2, _NEIGHBOR_OFFSET_ARRAY))
+
+    if isinstance(image, CategoricalImage):
+        mask1 = image._cached_mask(value1)
+        mask2 = image._cached_mask(value2)
+    else:
         # Create binary masks for each category
-        mask1 = image == value1
-        mask2 = image == value2
+        mask1 = data == value1
+        mask2 = data == value2
 
         # If either category doesn't exist in the image, they can't touch
-        if not np.any(mask1) or not np.any(mask2):
+        if not mask1.any() or not mask2.any():
             return False
 
-    # Dilate the first category mask to include all neighboring positions
-    # Using 26-connectivity (3x3x3 structuring element)
-    structure = ndimage.generate_binary_structure(3, 3)
-    dilated_mask1 = ndimage.binary_dilation(mask1, structure=structure)
+    # Restrict the search to where the grown bounding boxes overlap
+    window = _adjacency_window(mask1, mask2)
+    if window is None:
+        return False
+    mask1 = mask1[window]
+    mask2 = mask2[window]
+
+    # Split very large volumes into tiles scanned concurrently
+    workers = min(_PARALLEL_WORKERS, mask1.shape[0] // 2)
+    if mask1.size >= _PARALLEL_MIN_VOXELS and workers > 1:
+        return _any_adjacent_parallel(mask1, mask2, workers)
 
-    # Check if any dilated voxels from category1 overlap with category2
-    return bool(np.any(dilated_mask1 & mask2))
+    # The bit-packed scan reads each mask once to pack it and then works on 1/8
+    # of the bytes. At any density it measured faster than a 3x3x3
+    # ndimage.convolve pass (10-25x) and than coordinate lookups, which need
+    # a full-volume argwhere just to find the voxels (5-9x).
+    return _any_adjacent(mask1, mask2)
 
 
 def check_green_touches_red(
@@ -4,6 +4,26 @@ from dataclasses import dataclass, field
 
 import numpy as np
 
+# Number of category masks kept per image; the oldest is dropped first so
+# images with many categories do not hold a boolean volume for each
+_MASK_CACHE_SIZE = 4
+
+
+def _index_dtype(num_categories: int) -> type[np.integer]:
+    """Get the smallest unsigned dtype able to encode the given number of categories.
+
+    Args:
+        num_categories: Number of distinct categories to encode
+
+    Returns:
+        np.uint8, np.uint16 or np.uint32
+    """
+    if num_categories <= 256:
+        return np.uint8
+    if num_categories <= 65536:
+        return np.uint16
+    return np.uint32
+
 
 @dataclass(frozen=True)
 class CategoricalImage:
@@ -14,7 +34,8 @@ class CategoricalImage:
     as first-class citizens, with integer encoding handled internally.
 
     Attributes:
-        data: 3D numpy array with integer-encoded categorical values
+        data: 3D numpy array with integer-encoded categorical values, stored in
+            the smallest unsigned dtype that fits the number of categories
         categories: Tuple of category names in encoding order
 
     Example:
@@ -35,6 +56,10 @@ class CategoricalImage:
     data: np.ndarray
     categories: tuple[str, ...] | list[str]
     _category_to_index: dict[str, int] = field(init=False, repr=False)
+    _mask_cache: dict[int, np.ndarray] = field(init=False, repr=False, compare=False)
+    _counts: np.ndarray = field(init=False, repr=False, compare=False)
+    _present_mask: np.ndarray = field(init=False, repr=False, compare=False)
+    _category_array: np.ndarray = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
         """Validate and process data after initialization."""
@@ -49,33 +74,85 @@ class CategoricalImage:
         if len(self.categories) == 0:
             raise ValueError("Categories list cannot be empty")
 
-        if len(self.categories) != len(set(self.categories)):
+        # Convert categories to a tuple and map names to indices in one pass;
+        # duplicate names collapse into fewer dict entries
+        categories = tuple(self.categories)
+        category_to_index = {category: idx for idx, category in enumerate(categories)}
+        if len(category_to_index) != len(categories):
             raise ValueError("Category names must be unique")
 
-        # Validate data values are within valid range
-        max_value = np.max(self.data)
-        min_value = np.min(self.data)
+        # Validate data values are within valid range (one reduction each). The
+        # NumPy scalars are compared as-is so float data such as -0.5 is not
+        # truncated into range first.
+        min_value = self.data.min()
+        max_value = self.data.max()
 
         if min_value < 0:
             raise ValueError(f"Data contains negative values: {min_value}")
 
-        if max_value >= len(self.categories):
+        if max_value >= len(categories):
             raise ValueError(
-                f"Data contains value {max_value} but only {len(self.categories)} "
-                f"categories provided (valid range: 0-{len(self.categories) - 1})"
+                f"Data contains value {max_value} but only {len(categories)} "
+                f"categories provided (valid range: 0-{len(categories) - 1})"
             )
 
-        # Convert data to int32 and make immutable (copy to avoid external mutation)
-        object.__setattr__(self, "data", self.data.astype(np.int32, copy=True))
+        # Convert data to the smallest index dtype that fits all categories and
+        # make immutable (copy to avoid external mutation). C order keeps the
+        # last axis stride-1 for the shifted-slice comparisons.
+        dtype = _index_dtype(len(categories))
+        object.__setattr__(self, "data", self.data.astype(dtype, order="C", copy=True))
+        object.__setattr__(self, "categories", categories)
+
+        self._build_index(category_to_index)
+
+    @classmethod
+    def _unchecked(cls, data: np.ndarray, categories: tuple[str, ...]) -> "CategoricalImage":
+        """Internal constructor for data already known to satisfy all invariants.
+
+        Skips the validation scans and defensive copy of ``__post_init__``. The
+        caller must pass a 3D array it owns, in the dtype chosen by
+        ``_index_dtype``, with values in range of a tuple of unique categories.
+
+        Args:
+            data: Encoded 3D array, taken over without copying
+            categories: Tuple of unique category names in encoding order
+
+        Returns:
+            A new CategoricalImage instance
+        """
+        image = object.__new__(cls)
+        object.__setattr__(image, "data", data)
+        object.__setattr__(image, "categories", categories)
+        image._build_index({category: idx for idx, category in enumerate(categories)})
+        return image
 
-        # Convert categories to tuple if it's a list
-        if isinstance(self.categories, list):
-            object.__setattr__(self, "categories", tuple(self.categories))
+    def _build_index(self, category_to_index: dict[str, int]) -> None:
+        """Internal method to set up the lookups derived from the data and categories.
 
-        # Build category to index mapping
-        category_to_index = {cat: idx for idx, cat in enumerate(self.categories)}
+        Args:
+            category_to_index: Mapping from each category name to its encoded value
+        """
         object.__setattr__(self, "_category_to_index", category_to_index)
 
+        # Lookup table from index to name for get_labels (object dtype so names
+        # are not truncated)
+        category_array = np.array(self.categories, dtype=object)
+        category_array.flags.writeable = False
+        object.__setattr__(self, "_category_array", category_array)
+
+        # Read-only masks are computed lazily by _cached_mask and the newest
+        # ones are reused on repeat calls
+        object.__setattr__(self, "_mask_cache", {})
+
+        # Count all categories in one pass so presence and count queries never
+        # rescan the volume
+        counts = np.bincount(self.data.ravel(), minlength=len(self.categories))
+        counts.flags.writeable = False
+        present_mask = counts > 0
+        present_mask.flags.writeable = False
+        object.__setattr__(self, "_counts", counts)
+        object.__setattr__(self, "_present_mask", present_mask)
+
     @classmethod
     def from_labels(cls, labels: np.ndarray) -> "CategoricalImage":
         """Create a CategoricalImage from an array of string labels.
@@ -96,16 +173,19 @@ class CategoricalImage:
         if labels.size == 0:
             raise ValueError("Labels array cannot be empty")
 
-        # Find unique categories and create encoding
-        unique_categories = np.unique(labels)
-        categories = tuple(unique_categories)
+        # Object arrays of strings (e.g. from get_labels) would sort via Python
+        # string comparisons; fixed-width unicode sorts in C without truncating
+        # labels. Other objects keep their own type as category names.
+        if labels.dtype == object and all(isinstance(label, str) for label in labels.flat):
+            labels = labels.astype(str)
 
-        # Encode labels as integers
-        data = np.zeros(labels.shape, dtype=np.int32)
-        for idx, category in enumerate(categories):
-            data[labels == category] = idx
+        # Find unique categories and encode labels as their indices in one sort
+        unique_categories, inverse = np.unique(labels, return_inverse=True)
+        categories = tuple(unique_categories.tolist())
+        data = inverse.reshape(labels.shape).astype(_index_dtype(len(categories)), order="C")
 
-        return cls(data, categories)
+        # The encoding is valid by construction, so skip re-validation
+        return cls._unchecked(data, categories)
 
     @property
     def shape(self) -> tuple[int, int, int]:
@@ -121,11 +201,11 @@ class CategoricalImage:
         Returns:
             True if the category is defined and exists in the image
         """
-        if category not in self._category_to_index:
+        category_index = self._category_to_index.get(category)
+        if category_index is None:
             return False
 
-        category_index = self._category_to_index[category]
-        return bool(np.any(self.data == category_index))
+        return bool(self._present_mask[category_index])
 
     def get_mask(self, category: str) -> np.ndarray:
         """Get a binary mask for voxels belonging to a specific category.
@@ -148,14 +228,38 @@ class CategoricalImage:
             >>> print(mask)
             [[[True False True]]]
         """
-        if category not in self._category_to_index:
+        category_index = self._category_to_index.get(category)
+        if category_index is None:
             raise ValueError(
                 f"Category '{category}' not found. "
                 f"Available categories: {', '.join(self.categories)}"
             )
 
-        category_index = self._category_to_index[category]
-        return self.data == category_index
+        # Callers own the returned mask, so hand out a copy of the cached one
+        return self._cached_mask(category_index).copy()
+
+    def _cached_mask(self, category_index: int) -> np.ndarray:
+        """Internal method to get a shared, read-only mask for an encoded value.
+
+        Masks of the last few categories computed are cached, so repeated
+        adjacency checks on the same image do not rescan the volume.
+
+        Args:
+            category_index: Encoded value of the category
+
+        Returns:
+            Read-only boolean numpy array of the same shape as the image
+        """
+        mask = self._mask_cache.get(category_index)
+        if mask is None:
+            mask = self.data == category_index
+            mask.flags.writeable = False
+            if len(self._mask_cache) >= _MASK_CACHE_SIZE:
+                # Dicts keep insertion order, so the first key is the oldest.
+                # Another thread may have evicted it already.
+                self._mask_cache.pop(next(iter(self._mask_cache), None), None)
+            self._mask_cache[category_index] = mask
+        return mask
 
     def get_labels(self) -> np.ndarray:
         """Get the image as a 3D array of category name strings.
@@ -170,10 +274,8 @@ class CategoricalImage:
             >>> print(labels)
             [[['background' 'liver' 'background']]]
         """
-        labels = np.empty(self.data.shape, dtype=object)
-        for idx, category in enumerate(self.categories):
-            labels[self.data == idx] = category
-        return labels
+        # Gather category names by index in a single pass over the data
+        return self._category_array[self.data]
 
     def count_voxels(self, category: str) -> int:
         """Count the number of voxels belonging to a category.
@@ -187,14 +289,14 @@ class CategoricalImage:
         Raises:
             ValueError: If the category is not defined for this image
         """
-        if category not in self._category_to_index:
+        category_index = self._category_to_index.get(category)
+        if category_index is None:
             raise ValueError(
                 f"Category '{category}' not found. "
                 f"Available categories: {', '.join(self.categories)}"
             )
 
-        category_index = self._category_to_index[category]
-        return int(np.sum(self.data == category_index))
+        return int(self._counts[category_index])
 
     def get_category_stats(self) -> dict[str, int]:
         """Get voxel counts for all categories.
@@ -202,7 +304,7 @@ class CategoricalImage:
         Returns:
             Dictionary mapping category names to voxel counts
         """
-        return {cat: self.count_voxels(cat) for cat in self.categories}
+        return dict(zip(self.categories, self._counts.tolist()))
 
     def _get_category_index(self, category: str) -> int:
         """Internal method to get the integer index for a category.
@@ -216,9 +318,10 @@ class CategoricalImage:
         Raises:
             ValueError: If category not found
         """
-        if category not in self._category_to_index:
+        category_index = self._category_to_index.get(category)
+        if category_index is None:
             raise ValueError(
                 f"Category '{category}' not found. "
                 f"Available categories: {', '.join(self.categories)}"
             )
-        return self._category_to_index[category]
+        return category_index
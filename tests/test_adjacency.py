@@ -3,6 +3,7 @@
 import numpy as np
 import pytest
 
+from src.imaging import adjacency
 from src.imaging.adjacency import check_category_adjacency, check_green_touches_red
 from src.imaging.categorical import CategoricalImage
 
@@ -319,3 +320,270 @@ def test_multiple_green_red_regions():
 
     # At [1, 1, 1] green is adjacent to [1, 1, 2] red
     assert check_green_touches_red(image) is True
+
+
+def test_all_26_neighbor_offsets():
+    """Test that every 26-connected offset is detected, in both directions."""
+    for dz in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                if (dz, dy, dx) == (0, 0, 0):
+                    continue
+
+                data = np.zeros((3, 3, 3), dtype=np.int32)
+                data[1, 1, 1] = 1
+                data[1 + dz, 1 + dy, 1 + dx] = 2
+
+                image = CategoricalImage(data, ["background", "green", "red"])
+
+                assert check_category_adjacency(image, "green", "red") is True
+                assert check_category_adjacency(image, "red", "green") is True
+
+
+def test_distance_two_is_not_adjacent():
+    """Test that voxels two steps apart along any axis are not adjacent."""
+    for axis in range(3):
+        data = np.zeros((3, 3, 3), dtype=np.int32)
+        index = [1, 1, 1]
+        index[axis] = 0
+        data[tuple(index)] = 1
+        index[axis] = 2
+        data[tuple(index)] = 2
+
+        image = CategoricalImage(data, ["background", "green", "red"])
+
+        assert check_green_touches_red(image) is False
+
+
+def test_sparse_categories_in_large_volume():
+    """Test adjacency of a few isolated voxels in an otherwise empty volume."""
+    data = np.zeros((64, 64, 64), dtype=np.int32)
+    data[10, 20, 30] = 1
+    data[11, 21, 29] = 2
+    data[40, 40, 40] = 2
+
+    image = CategoricalImage(data, ["background", "green", "red"])
+    assert check_green_touches_red(image) is True
+
+    data[11, 21, 29] = 0
+    image = CategoricalImage(data, ["background", "green", "red"])
+    assert check_green_touches_red(image) is False
+
+
+def _brute_force_touches(data: np.ndarray, value1: int, value2: int) -> bool:
+    """Reference adjacency check visiting every voxel and its 26 neighbors."""
+    depth, height, width = data.shape
+    for z, y, x in np.argwhere(data == value1):
+        for nz in range(max(z - 1, 0), min(z + 2, depth)):
+            for ny in range(max(y - 1, 0), min(y + 2, height)):
+                for nx in range(max(x - 1, 0), min(x + 2, width)):
+                    if data[nz, ny, nx] == value2:
+                        return True
+    return False
+
+
+def _random_images(seed: int, count: int = 40) -> list[CategoricalImage]:
+    """Build random small images with a few scattered green and red voxels."""
+    rng = np.random.default_rng(seed)
+    categories = ["background", "green", "red", "blue"]
+    return [
+        CategoricalImage(
+            rng.choice(4, size=(6, 7, 8), p=[0.97, 0.01, 0.01, 0.01]),
+            categories,
+        )
+        for _ in range(count)
+    ]
+
+
+@pytest.fixture
+def no_compiled_kernels(monkeypatch):
+    """Disable the numba and ahead-of-time kernels to exercise the NumPy path."""
+    monkeypatch.setattr(adjacency, "_any_adjacent_3d", None)
+    monkeypatch.setattr(adjacency, "_touches", None)
+    monkeypatch.setattr(adjacency, "_touches_u8", None)
+
+
+def test_random_images_match_brute_force():
+    """Test adjacency on random images against a brute-force reference."""
+    for image in _random_images(seed=0):
+        expected = _brute_force_touches(image.data, 1, 2)
+        assert check_green_touches_red(image) is expected
+
+
+def test_compiled_kernels_match_brute_force():
+    """Test the JIT and ahead-of-time kernels directly, when available."""
+    kernels = [
+        (kernel, offsets)
+        for kernel, offsets in (
+            (adjacency._touches, adjacency._NEIGHBOR_OFFSET_ARRAY),
+            (adjacency._any_adjacent_3d, adjacency._FORWARD_OFFSET_ARRAY),
+            (adjacency._touches_u8, adjacency._NEIGHBOR_OFFSET_ARRAY),
+        )
+        if kernel is not None
+    ]
+    if not kernels:
+        pytest.skip("No compiled adjacency kernel available")
+
+    for image in _random_images(seed=3):
+        expected = _brute_force_touches(image.data, 1, 2)
+        for kernel, offsets in kernels:
+            assert kernel(image.data, 1, 2, offsets) == expected
+            assert kernel(image.data, 2, 1, offsets) == expected
+
+
+@pytest.mark.skipif(adjacency._touches_u8 is None, reason="AOT kernel is not built")
+def test_aot_kernel_skips_out_of_range_values(monkeypatch):
+    """Test that legacy map values outside uint8 range do not wrap in the AOT kernel."""
+    monkeypatch.setattr(adjacency, "_any_adjacent_3d", None)
+    monkeypatch.setattr(adjacency, "_touches", None)
+
+    # 300 wraps to 44 as a uint8 argument
+    data = np.array([[[44, 2]]], dtype=np.uint8)
+    category_map = {300: "green", 2: "red", 44: "other"}
+
+    assert check_green_touches_red(data, category_map) is False
+
+
+def test_numpy_fallback_without_numba(no_compiled_kernels):
+    """Test that results are unchanged when no compiled kernel is available."""
+    for image in _random_images(seed=1):
+        expected = _brute_force_touches(image.data, 1, 2)
+        assert check_green_touches_red(image) is expected
+
+
+def test_non_contiguous_legacy_arrays_without_numba(no_compiled_kernels):
+    """Test the NumPy path on transposed and Fortran-ordered legacy arrays."""
+    category_map = {0: "background", 1: "green", 2: "red", 3: "blue"}
+
+    for image in _random_images(seed=5):
+        for data in (image.data.transpose(2, 0, 1), np.asfortranarray(image.data)):
+            expected = _brute_force_touches(data, 1, 2)
+            assert check_green_touches_red(data, category_map) is expected
+
+
+def test_distant_regions_in_large_volume():
+    """Test that large regions with separated bounding boxes do not touch."""
+    data = np.zeros((100, 100, 50), dtype=np.int32)
+    data[10:20, 10:20, 10:20] = 1
+    data[22:30, 10:20, 10:20] = 2
+
+    image = CategoricalImage(data, ["background", "green", "red"])
+    assert check_green_touches_red(image) is False
+
+    # Overlapping bounding boxes without touching voxels
+    data[25, 60:70, 30:40] = 1
+    image = CategoricalImage(data, ["background", "green", "red"])
+    assert check_green_touches_red(image) is False
+
+
+def test_parallel_tiles_detect_pairs_across_seams():
+    """Test that the tiled parallel scan finds pairs straddling tile seams."""
+    for seam_z in range(1, 8):
+        mask1 = np.zeros((8, 3, 3), dtype=bool)
+        mask2 = np.zeros((8, 3, 3), dtype=bool)
+        mask1[seam_z - 1, 1, 0] = True
+        mask2[seam_z, 1, 1] = True
+
+        assert adjacency._any_adjacent_parallel(mask1, mask2, workers=4) is True
+        assert adjacency._any_adjacent_parallel(mask2, mask1, workers=4) is True
+
+        # Two voxels apart along x
+        mask2[seam_z, 1, 1] = False
+        mask2[seam_z, 1, 2] = True
+
+        assert adjacency._any_adjacent_parallel(mask1, mask2, workers=4) is False
+
+
+def test_packed_scan_matches_brute_force():
+    """Test the bit-packed scan on random masks, including multi-word rows."""
+    rng = np.random.default_rng(2)
+    for shape in [(1, 1, 1), (2, 3, 1), (4, 5, 63), (3, 4, 64), (3, 3, 65), (2, 2, 130)]:
+        for _ in range(10):
+            data = rng.choice(3, size=shape, p=[0.96, 0.02, 0.02])
+            expected = _brute_force_touches(data, 1, 2)
+            assert adjacency._any_adjacent(data == 1, data == 2) is expected
+
+
+def test_dense_numpy_fallback(no_compiled_kernels):
+    """Test the NumPy path on dense interleaved slabs of two categories."""
+    # Slabs cycle green, background, red, background along the first axis
+    data = np.zeros((40, 30, 20), dtype=np.int32)
+    data[0::4] = 1
+    data[2::4] = 2
+    categories = ["background", "green", "red"]
+
+    assert check_green_touches_red(CategoricalImage(data, categories)) is False
+
+    rng = np.random.default_rng(4)
+    for _ in range(10):
+        touching = data.copy()
+        z = rng.integers(0, 10) * 4 + 1
+        touching[z, rng.integers(0, 30), rng.integers(0, 20)] = rng.integers(1, 3)
+
+        assert check_green_touches_red(CategoricalImage(touching, categories)) is True
+
+
+def test_dense_pairs_use_packed_scan(monkeypatch):
+    """Test that dense category pairs skip the compiled kernels."""
+
+    def fail(*args):
+        raise AssertionError("compiled kernel called for a dense pair")
+
+    monkeypatch.setattr(adjacency, "_any_adjacent_3d", fail)
+    monkeypatch.setattr(adjacency, "_touches", fail)
+    monkeypatch.setattr(adjacency, "_touches_u8", fail)
+
+    data = np.zeros((20, 20, 20), dtype=np.int32)
+    data[0::4] = 1
+    data[2::4] = 2
+    categories = ["background", "green", "red"]
+
+    assert check_green_touches_red(CategoricalImage(data, categories)) is False
+
+    data[1, 5, 5] = 1
+    assert check_green_touches_red(CategoricalImage(data, categories)) is True
+
+
+def test_legacy_object_array():
+    """Test that object arrays of integers use the mask path instead of a kernel."""
+    category_map = {0: "background", 1: "green", 2: "red"}
+
+    touching = np.array([[[1, 2, 0]]], dtype=object)
+    apart = np.array([[[1, 0, 2]]], dtype=object)
+
+    assert check_green_touches_red(touching, category_map) is True
+    assert check_green_touches_red(apart, category_map) is False
+
+
+@pytest.mark.parametrize("numpy_only", [False, True])
+def test_big_endian_legacy_array(request, numpy_only):
+    """Test that legacy arrays in non-native byte order are checked correctly."""
+    if numpy_only:
+        request.getfixturevalue("no_compiled_kernels")
+    category_map = {0: "background", 1: "green", 2: "red"}
+
+    for dtype in (">i4", ">u2"):
+        assert check_green_touches_red(np.array([[[1, 2, 0]]], dtype=dtype), category_map)
+        assert not check_green_touches_red(np.array([[[1, 0, 2]]], dtype=dtype), category_map)
+
+
+@pytest.mark.parametrize("numpy_only", [False, True])
+def test_legacy_map_values_outside_dtype_range(request, numpy_only):
+    """Test that map values which cannot occur in the array never touch."""
+    if numpy_only:
+        request.getfixturevalue("no_compiled_kernels")
+    data = np.array([[[1, 2, 0]]], dtype=np.uint8)
+
+    for green in (2**64, 300, -1, None):
+        category_map = {0: "background", green: "green", 2: "red"}
+        assert check_green_touches_red(data, category_map) is False
+
+
+def test_legacy_absent_and_same_category():
+    """Test legacy arrays with a mapped but absent category and a repeated one."""
+    image = np.array([[[1, 0, 1]]])
+    category_map = {0: "background", 1: "green", 2: "red"}
+
+    assert check_green_touches_red(image, category_map) is False
+    assert check_category_adjacency(image, "green", "green", category_map) is True
+    assert check_category_adjacency(image, "red", "red", category_map) is False
@@ -27,6 +27,19 @@ def test_create_from_labels():
     assert set(image.categories) == {"liver", "kidney"}
 
 
+def test_from_labels_matches_constructor():
+    """Test that from_labels builds the same image as the validating constructor."""
+    labels = np.array([[["liver", "kidney", "liver"], ["kidney", "liver", "kidney"]]])
+
+    image = CategoricalImage.from_labels(labels)
+    expected = CategoricalImage(image.data, list(image.categories))
+
+    assert image.data.dtype == expected.data.dtype
+    assert np.array_equal(image.data, expected.data)
+    assert image.categories == expected.categories
+    assert np.array_equal(image.get_mask("liver"), expected.get_mask("liver"))
+
+
 def test_get_mask():
     """Test getting binary mask for a category."""
     data = np.array([[[0, 1, 2], [1, 2, 0], [2, 0, 1]]])
@@ -42,6 +55,47 @@ def test_get_mask():
     assert np.array_equal(liver_mask, expected)
 
 
+def test_get_mask_returns_writable_copy():
+    """Test that get_mask returns an independent mask the caller can modify."""
+    data = np.array([[[0, 1, 2], [1, 2, 0], [2, 0, 1]]])
+    categories = ["background", "liver", "kidney"]
+
+    image = CategoricalImage(data, categories)
+    liver_mask = image.get_mask("liver")
+    liver_mask[...] = False
+
+    assert image.get_mask("liver") is not liver_mask
+    assert image.get_mask("liver").sum() == 3
+
+
+def test_cached_mask_is_shared_and_read_only():
+    """Test that the internal mask cache reuses a read-only array."""
+    data = np.array([[[0, 1, 2], [1, 2, 0], [2, 0, 1]]])
+    categories = ["background", "liver", "kidney"]
+
+    image = CategoricalImage(data, categories)
+    liver_mask = image._cached_mask(1)
+
+    assert image._cached_mask(1) is liver_mask
+    assert not liver_mask.flags.writeable
+
+
+def test_mask_cache_is_bounded():
+    """Test that the mask cache drops the oldest masks beyond its capacity."""
+    data = np.arange(8).reshape(2, 2, 2)
+    categories = [f"organ{i}" for i in range(8)]
+
+    image = CategoricalImage(data, categories)
+    first_mask = image._cached_mask(0)
+    for category_index in range(1, 8):
+        image._cached_mask(category_index)
+
+    assert len(image._mask_cache) == 4
+    assert image._cached_mask(7) is image._cached_mask(7)
+    assert image._cached_mask(0) is not first_mask
+    assert np.array_equal(image._cached_mask(0), first_mask)
+
+
 def test_has_category():
     """Test checking if category exists in image."""
     data = np.array([[[0, 1, 0], [0, 1, 0]]])
@@ -77,6 +131,18 @@ def test_get_category_stats():
     assert stats == {"background": 3, "liver": 4, "kidney": 2}
 
 
+def test_get_category_stats_repeated_calls():
+    """Test that cached stats are not affected by mutating a returned dict."""
+    data = np.array([[[0, 1, 1], [1, 2, 0], [2, 0, 1]]])
+    categories = ["background", "liver", "kidney"]
+
+    image = CategoricalImage(data, categories)
+    stats = image.get_category_stats()
+    stats["liver"] = 0
+
+    assert image.get_category_stats() == {"background": 3, "liver": 4, "kidney": 2}
+
+
 def test_get_labels():
     """Test converting back to string labels."""
     data = np.array([[[0, 1, 2]]])
@@ -101,6 +167,27 @@ def test_get_labels_roundtrip():
     assert np.array_equal(original_labels, recovered_labels)
 
 
+def test_from_labels_object_array_roundtrip():
+    """Test creating from the object-dtype labels returned by get_labels."""
+    data = np.array([[[0, 1, 2], [2, 1, 0]]])
+    image = CategoricalImage(data, ["background", "liver", "a-much-longer-kidney-label"])
+
+    recovered = CategoricalImage.from_labels(image.get_labels())
+
+    assert np.array_equal(recovered.get_labels(), image.get_labels())
+    assert all(type(category) is str for category in recovered.categories)
+
+
+def test_from_labels_object_array_of_non_strings():
+    """Test that non-string object labels keep their type as category names."""
+    labels = np.array([[[2, 1, 2]]], dtype=object)
+
+    image = CategoricalImage.from_labels(labels)
+
+    assert image.categories == (1, 2)
+    assert np.array_equal(image.data, [[[1, 0, 1]]])
+
+
 def test_data_is_copied():
     """Test that data is copied to prevent external modification."""
     data = np.array([[[0, 1, 2]]])
@@ -115,6 +202,24 @@ def test_data_is_copied():
     assert image.data[0, 0, 0] == 0
 
 
+def test_data_uses_compact_dtype():
+    """Test that data is stored in the smallest dtype fitting the categories."""
+    data = np.array([[[0, 1, 2]]], dtype=np.int64)
+
+    assert CategoricalImage(data, ["a", "b", "c"]).data.dtype == np.uint8
+    assert CategoricalImage(data, [str(i) for i in range(300)]).data.dtype == np.uint16
+    assert CategoricalImage(data, [str(i) for i in range(70000)]).data.dtype == np.uint32
+
+
+def test_data_is_c_contiguous():
+    """Test that transposed input data is stored in C order."""
+    data = np.arange(24).reshape(2, 3, 4).transpose(2, 1, 0) % 3
+    image = CategoricalImage(data, ["a", "b", "c"])
+
+    assert image.data.flags.c_contiguous
+    assert np.array_equal(image.data, data)
+
+
 def test_categories_is_copied():
     """Test that categories list is copied."""
     data = np.array([[[0, 1, 2]]])
@@ -192,6 +297,15 @@ def test_negative_data_values():
         CategoricalImage(data, categories)
 
 
+def test_negative_float_data_values():
+    """Test that negative fractional values are rejected rather than truncated."""
+    data = np.array([[[0.0, -0.5, 1.0]]])
+    categories = ["a", "b"]
+
+    with pytest.raises(ValueError, match="Data contains negative values: -0.5"):
+        CategoricalImage(data, categories)
+
+
 def test_get_mask_nonexistent_category():
     """Test that getting mask for undefined category raises ValueError."""
     data = np.array([[[0, 1]]])